@@ -1,8 +1,12 @@
 import re
+from functools import lru_cache
 
 from . import imap_utf7
 from .utils import check_command_status, quote, pairs_to_dict
 
+_STATUS_VALUES_RE = re.compile(rb'\((?P<values>[^()]*)\)\s*$')  # last parenthesized list, folder name may have ()
+_FOLDER_ITEM_RE = re.compile(r'\((?P<flags>[\S ]*)\) "(?P<delim>[\S ]+)" (?P<name>.+)')
+
 
 class MailBoxFolderWrongStatusError(Exception):
     """Wrong folder status error"""
@@ -18,8 +22,9 @@ class MailBoxFolderManager:
         self._current_folder = None
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def _encode_folder(folder: str or bytes) -> bytes:
-        """Encode folder name"""
+        """Encode folder name, cached - the same folders are used repeatedly"""
         if isinstance(folder, bytes):
             return quote(folder)
         else:
@@ -85,7 +90,7 @@ class MailBoxFolderManager:
         check_command_status(command, status_result)
         result = self.mailbox.box._untagged_response(status_result[0], status_result[1], command)
         check_command_status(command, result)
-        values = result[1][0].decode().split('(')[1].split(')')[0].split(' ')
+        values = _STATUS_VALUES_RE.search(result[1][0]).group('values').decode().split()
         return {k: int(v) for k, v in pairs_to_dict(values).items() if str(v).isdigit()}
 
     def list(self, folder: str or bytes = '', search_args: str = '*', subscribed_only: bool = False) -> list:
@@ -102,7 +107,6 @@ class MailBoxFolderManager:
             name: str - folder name,
         )]
         """
-        folder_item_re = re.compile(r'\((?P<flags>[\S ]*)\) "(?P<delim>[\S ]+)" (?P<name>.+)')
         command = 'LSUB' if subscribed_only else 'LIST'
         typ, data = self.mailbox.box._simple_command(command, self._encode_folder(folder), search_args)
         typ, data = self.mailbox.box._untagged_response(typ, data, command)
@@ -110,7 +114,7 @@ class MailBoxFolderManager:
         for folder_item in data:
             if not folder_item:
                 continue
-            folder_match = re.search(folder_item_re, imap_utf7.decode(folder_item))
+            folder_match = _FOLDER_ITEM_RE.search(imap_utf7.decode(folder_item))
             folder = folder_match.groupdict()
             if folder['name'].startswith('"') and folder['name'].endswith('"'):
                 folder['name'] = folder['name'][1:len(folder['name']) - 1]
@@ -7,8 +7,12 @@ This is "&" in that modified UTF-7 convention, since "+" is considered as mainly
 Full description in the RFC 3501, section 5.1.3.
 """
 
+import re
 import binascii
 
+# printable US-ASCII characters except "&" represent themselves
+_DIRECT_CHARS_RE = re.compile(r'[\x20-\x25\x27-\x7e]*')
+
 
 # ENCODING
 # --------
@@ -23,6 +27,8 @@ def _do_b64(_in, r):
 
 
 def encode(s: str) -> bytes:
+    if _DIRECT_CHARS_RE.fullmatch(s):
+        return s.encode()
     res = []
     _in = []
     for c in s:
@@ -46,6 +52,8 @@ def _modified_unbase64(s):
 
 
 def decode(s: bytes) -> str:
+    if b'&' not in s:
+        return s.decode('latin-1')  # each byte is a char, same as chr()
     res = []
     decode_arr = bytearray()
     for c in s:
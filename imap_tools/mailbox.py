@@ -1,8 +1,12 @@
+import re
 import imaplib
+import itertools
 
 from .message import MailMessage
 from .folder import MailBoxFolderManager
-from .utils import cleaned_uid_set, check_command_status
+from .utils import cleaned_uid_set, check_command_status, chunks
+
+_FETCH_MESSAGE_ID_RE = re.compile(rb'(?P<id>\d+) \(')
 
 # Maximal line length when calling readline(). This is to prevent reading arbitrary length lines.
 imaplib._MAXLINE = 4 * 1024 * 1024  # 4Mb
@@ -26,6 +30,8 @@ class MailBox:
 
     email_message_class = MailMessage
     folder_manager_class = MailBoxFolderManager
+    uid_bulk = 100  # max number of uids per 1 command in actions: delete, copy, move, flag, seen
+    fetch_pipeline_depth = 1  # number of bulk FETCH commands sent before reading their responses, 1 - no pipelining
 
     def __init__(self, host='', port=None, ssl=True, keyfile=None, certfile=None, ssl_context=None):
         """
@@ -53,6 +59,7 @@ class MailBox:
         self._initial_folder = None
         self.folder = None
         self.login_result = None
+        self._capabilities = None
 
     def login(self, username: str, password: str, initial_folder: str = 'INBOX'):
         self._username = username
@@ -76,51 +83,171 @@ class MailBox:
         return criteria if type(criteria) is bytes else str(criteria).encode(charset)
 
     def fetch(self, criteria: str or bytes = 'ALL', charset: str = 'US-ASCII', limit: int = None,
-              miss_defect=True, miss_no_uid=True, mark_seen=True, reverse=False) -> iter:
+              miss_defect=True, miss_no_uid=True, mark_seen=True, reverse=False, bulk: int = 100,
+              headers_only=False) -> iter:
         """
         Mail message generator in current folder by search criteria
         :param criteria: message search criteria (see examples at ./doc/imap_search_criteria.txt)
         :param charset: IANA charset, indicates charset of the strings that appear in the search criteria. See rfc2978
         :param limit: limit number of read emails, useful for actions with a large number of messages, like "move"
-        :param miss_defect: miss emails with defects
+        :param miss_defect: miss emails with defects, email is parsed for the check - use False to parse lazily,
+            ignored for headers_only - header block without body is defective for multipart emails
         :param miss_no_uid: miss emails without uid
-        :param mark_seen: mark emails as seen on fetch
+        :param mark_seen: mark emails as seen on fetch (ignored for headers_only),
+            False - BODY.PEEK is used, no need to unset SEEN flag later
         :param reverse: in order from the larger date to the smaller
+        :param bulk: number of emails fetched per 1 command, 0 or None - fetch emails one by one
+            *all emails of the command are kept in memory and, with mark_seen, are marked as seen,
+            even if iteration is stopped before they are yielded
+        :param headers_only: get only email headers (without text, html, attachments), never marks emails as seen
         :return generator: MailMessage
         """
         search_result = self.box.search(charset, self._criteria_encoder(criteria, charset))
         check_command_status('box.search', search_result)
-        message_id_set = search_result[1][0].decode().split(' ') if search_result[1][0] else ()
-        # first element is string with email numbers through the gap
-        for i, message_id in enumerate((reversed if reverse else iter)(message_id_set)):
-            if limit and i >= limit:
-                break
-            # get message by id
-            fetch_result = self.box.fetch(message_id, "(BODY[] UID FLAGS)" if mark_seen else "(BODY.PEEK[] UID FLAGS)")
-            check_command_status('box.fetch', fetch_result)
-            mail_message = self.email_message_class(fetch_result[1])
-            if miss_defect and mail_message.obj.defects:
-                continue
+        # first element is bytes with email numbers through the gap, imaplib accepts bytes message set
+        message_id_set = search_result[1][0].split() if search_result[1][0] else ()
+        message_id_set = tuple((reversed if reverse else iter)(message_id_set))[:limit or None]
+        if headers_only:
+            message_parts = "(BODY.PEEK[HEADER] UID FLAGS)"  # body is not read - do not mark as seen
+        else:
+            message_parts = "(BODY[] UID FLAGS)" if mark_seen else "(BODY.PEEK[] UID FLAGS)"
+        if bulk and self.fetch_pipeline_depth > 1:
+            fetch_data_set = self._fetch_pipelined(message_id_set, message_parts, bulk)
+        elif bulk:
+            fetch_data_set = self._fetch_in_bulk(message_id_set, message_parts, bulk)
+        else:
+            fetch_data_set = self._fetch_by_one(message_id_set, message_parts)
+        for fetch_data in fetch_data_set:
+            mail_message = self.email_message_class(fetch_data)
             if miss_no_uid and not mail_message.uid:
                 continue
+            # only stdlib parser has defects, header block of multipart email is always defective
+            if miss_defect and not headers_only and getattr(mail_message.obj, 'defects', None):
+                continue
             yield mail_message
 
+    def _fetch_by_one(self, message_id_set: (bytes,), message_parts: str) -> iter:
+        """Fetch data generator, 1 command per email"""
+        for message_id in message_id_set:
+            fetch_result = self.box.fetch(message_id, message_parts)
+            check_command_status('box.fetch', fetch_result)
+            yield fetch_result[1]
+
+    def _fetch_in_bulk(self, message_id_set: (bytes,), message_parts: str, bulk: int) -> iter:
+        """Fetch data generator, 1 command per <bulk> emails"""
+        for message_id_chunk in chunks(message_id_set, bulk):
+            fetch_result = self.box.fetch(b','.join(message_id_chunk), message_parts)
+            check_command_status('box.fetch', fetch_result)
+            yield from self._split_fetch_data(fetch_result[1], message_id_chunk)
+
+    def _fetch_pipelined(self, message_id_set: (bytes,), message_parts: str, bulk: int) -> iter:
+        """
+        Fetch data generator, 1 command per <bulk> emails,
+        <fetch_pipeline_depth> commands are sent before reading their responses
+        Saves round-trip time per command on high latency connections. Uses imaplib private API.
+        All sent commands are read before yield, no commands are in flight while the caller works with emails,
+        so any other commands may be used during iteration, and early stop of iteration is safe
+        """
+        message_id_chunk_iter = chunks(message_id_set, bulk)
+        while True:
+            message_id_chunk_set = list(itertools.islice(message_id_chunk_iter, self.fetch_pipeline_depth))
+            if not message_id_chunk_set:
+                return
+            tag_set = [self.box._command('FETCH', b','.join(message_id_chunk), message_parts)
+                       for message_id_chunk in message_id_chunk_set]
+            for fetch_result, message_id_chunk in zip(self._fetch_complete_all(tag_set), message_id_chunk_set):
+                check_command_status('box.fetch', fetch_result)
+                yield from self._split_fetch_data(fetch_result[1], message_id_chunk)
+
+    def _fetch_complete_all(self, tag_set: [bytes]) -> [tuple]:
+        """
+        Read responses of sent FETCH commands in order of sending
+        On error responses of the rest commands are read too, otherwise they get into results of next commands
+        """
+        result = []
+        try:
+            for tag in tag_set:
+                result.append(self._fetch_complete(tag))
+        except imaplib.IMAP4.error:
+            for tag in tag_set[len(result) + 1:]:
+                try:
+                    self._fetch_complete(tag)
+                except (imaplib.IMAP4.error, OSError):
+                    pass  # connection is broken, next command will raise
+            raise
+        return result
+
+    def _fetch_complete(self, tag: bytes) -> tuple:
+        """Read response of sent FETCH command with the tag"""
+        typ, data = self.box._command_complete('FETCH', tag)
+        return self.box._untagged_response(typ, data, 'FETCH')
+
+    @staticmethod
+    def _split_fetch_data(fetch_data: list, message_id_set: (bytes,)) -> [list]:
+        """
+        Split fetch data of several emails into fetch data of each email, in order of message_id_set
+        Items are grouped by email sequence number at their start: b'1 (UID 7 BODY[] {123}', b'1 (FLAGS (\\Seen))',
+        items without it, like b')' or b' UID 7 FLAGS (\\Seen))', continue data of the previous item
+        Server may return emails and items of the email in any order, emails without data tuple are skipped
+        """
+        result = {}
+        message_id = None
+        for fetch_item in fetch_data:
+            if fetch_item is None:
+                continue
+            message_id_match = _FETCH_MESSAGE_ID_RE.match(
+                (fetch_item[0] or b'') if type(fetch_item) is tuple else fetch_item)
+            if message_id_match:
+                message_id = message_id_match.group('id')
+            if message_id is not None:
+                result.setdefault(message_id, []).append(fetch_item)
+        return [result[i] for i in message_id_set
+                if i in result and any(type(j) is tuple for j in result[i])]
+
     def expunge(self) -> tuple:
         result = self.box.expunge()
         check_command_status('box.expunge', result)
         return result
 
+    def _uid_str_set(self, uid_list) -> [str]:
+        """Cleaned uid set, split into comma separated uid strings of <uid_bulk> uids each"""
+        uid_str = cleaned_uid_set(uid_list)
+        if not uid_str:
+            return []
+        return [','.join(uid_chunk) for uid_chunk in chunks(uid_str.split(','), self.uid_bulk)]
+
+    def _uid_in_bulk(self, check_name: str, uid_str_set: [str], command: str, *args) -> tuple:
+        """
+        Perform UID command for each uid string of uid_str_set
+        Avoids server errors like: "BAD [parse error: maximum request size exceeded]"
+        :return: command result with data of all commands: (typ, [data])
+        """
+        typ, data = None, []
+        for uid_str in uid_str_set:
+            result = self.box.uid(command, uid_str, *args)
+            check_command_status(check_name, result)
+            typ = result[0]
+            data.extend(result[1])
+        return typ, data
+
+    def _has_capability(self, name: str) -> bool:
+        """Check that server has the capability, capabilities are requested once after login"""
+        if self._capabilities is None:
+            capability_result = self.box.capability()
+            check_command_status('box.capability', capability_result)
+            self._capabilities = set(capability_result[1][-1].decode().upper().split())
+        return name in self._capabilities
+
     def delete(self, uid_list) -> (tuple, tuple) or None:
         """
         Delete email messages
         Do nothing on empty uid_list
         :return: None on empty uid_list, command results otherwise
         """
-        uid_str = cleaned_uid_set(uid_list)
-        if not uid_str:
+        uid_str_set = self._uid_str_set(uid_list)
+        if not uid_str_set:
             return None
-        store_result = self.box.uid('STORE', uid_str, '+FLAGS', r'(\Deleted)')
-        check_command_status('box.delete', store_result)
+        store_result = self._uid_in_bulk('box.delete', uid_str_set, 'STORE', '+FLAGS', r'(\Deleted)')
         expunge_result = self.expunge()
         return store_result, expunge_result
 
@@ -130,23 +257,27 @@ class MailBox:
         Do nothing on empty uid_list
         :return: None on empty uid_list, command results otherwise
         """
-        uid_str = cleaned_uid_set(uid_list)
-        if not uid_str:
+        uid_str_set = self._uid_str_set(uid_list)
+        if not uid_str_set:
             return None
-        copy_result = self.box.uid('COPY', uid_str, destination_folder)
-        check_command_status('box.copy', copy_result)
+        copy_result = self._uid_in_bulk('box.copy', uid_str_set, 'COPY', destination_folder)
         return copy_result
 
     def move(self, uid_list, destination_folder: str) -> (tuple, tuple) or None:
         """
         Move email messages into the specified folder
         Do nothing on empty uid_list
-        :return: None on empty uid_list, command results otherwise
+        Uses MOVE command (rfc6851) if server supports it: 1 command instead of COPY, STORE and EXPUNGE
+        :return: None on empty uid_list, command results otherwise: (copy_result, (store_result, expunge_result)),
+            for MOVE command: (move_result, None)
         """
         # here for avoid double fetch in uid_set
         uid_str = cleaned_uid_set(uid_list)
         if not uid_str:
             return None
+        if 'MOVE' in imaplib.Commands and self._has_capability('MOVE'):  # imaplib knows MOVE since python 3.6
+            move_result = self._uid_in_bulk('box.move', self._uid_str_set(uid_str), 'MOVE', destination_folder)
+            return move_result, None
         copy_result = self.copy(uid_str, destination_folder)
         delete_result = self.delete(uid_str)
         return copy_result, delete_result
@@ -158,15 +289,14 @@ class MailBox:
         Standard flags contains in MessageFlags.all
         :return: None on empty uid_list, command results otherwise
         """
-        uid_str = cleaned_uid_set(uid_list)
-        if not uid_str:
+        uid_str_set = self._uid_str_set(uid_list)
+        if not uid_str_set:
             return None
         if type(flag_set) is str:
             flag_set = [flag_set]
-        store_result = self.box.uid(
-            'STORE', uid_str, ('+' if value else '-') + 'FLAGS',
+        store_result = self._uid_in_bulk(
+            'box.flag', uid_str_set, 'STORE', ('+' if value else '-') + 'FLAGS',
             '({})'.format(' '.join(('\\' + i for i in flag_set))))
-        check_command_status('box.flag', store_result)
         expunge_result = self.expunge()
         return store_result, expunge_result
 
@@ -1,11 +1,31 @@
 import re
 import email
+import email.message
 import base64
 import imaplib
 from functools import lru_cache
-from email.header import decode_header
 
-from .utils import decode_value, parse_email_addresses, parse_email_date
+from .utils import decode_value, decode_header_value, parse_email_addresses, parse_email_date
+
+try:
+    from functools import cached_property
+except ImportError:  # python < 3.8
+    def cached_property(func):
+        return property(lru_cache()(func))
+
+try:
+    import fast_mail_parser
+except ImportError:
+    fast_mail_parser = None
+
+try:
+    import pybase64  # SIMD accelerated base64
+except ImportError:
+    pybase64 = None
+
+_HEADER_BLOCK_END_RE = re.compile(rb'\r?\n\r?\n')
+_HEADER_LINE_END_RE = re.compile(rb'\r?\n(?![ \t])')  # not folded line end
+_UID_RE = re.compile(rb'(^|[\s(])UID\s+(?P<uid>\d+)')
 
 
 class MailMessage:
@@ -13,15 +33,20 @@ class MailMessage:
 
     def __init__(self, fetch_data):
         raw_message_data, raw_uid_data, raw_flag_data = self._get_message_data_parts(fetch_data)
+        self._raw_message_data = raw_message_data
         self._raw_uid_data = raw_uid_data
         self._raw_flag_data = raw_flag_data
-        self.obj = email.message_from_bytes(raw_message_data)
 
     @classmethod
     def from_bytes(cls, raw_message_data: bytes):
         """Alternative constructor"""
         return cls([(None, raw_message_data)])
 
+    @cached_property
+    def obj(self):
+        """Original email.message.Message object, email is parsed on first access"""
+        return email.message_from_bytes(self._raw_message_data)
+
     @staticmethod
     def _get_message_data_parts(fetch_data) -> (bytes, bytes, [bytes]):
         """
@@ -33,124 +58,101 @@ class MailMessage:
         raw_uid_data = b''
         raw_flag_data = []
         for fetch_item in fetch_data:
-            # flags
-            if type(fetch_item) is bytes and imaplib.ParseFlags(fetch_item):
-                raw_flag_data.append(fetch_item)
+            # flags, substring check is much cheaper than ParseFlags regex for common b')' items
+            if type(fetch_item) is bytes:
+                if b'FLAGS' in fetch_item and imaplib.ParseFlags(fetch_item):
+                    raw_flag_data.append(fetch_item)
             # data, uid
-            if type(fetch_item) is tuple:
-                raw_uid_data = fetch_item[0]
-                raw_flag_data=fetch_item[0]
+            elif type(fetch_item) is tuple:
+                raw_uid_data = fetch_item[0] or b''
+                raw_flag_data.append(raw_uid_data)  # flags may be in data header: b'1 (FLAGS (\\Seen) BODY[] {9}'
                 raw_message_data = fetch_item[1]
         return raw_message_data, raw_uid_data, raw_flag_data
 
-    @property
-    @lru_cache()
+    @cached_property
     def uid(self) -> str or None:
         """Message UID"""
-        # zimbra, yandex, gmail, gmx
-        uid_match = re.search(r'UID\s+(?P<uid>\d+)', self._raw_uid_data.decode())
-        if uid_match:
-            return uid_match.group('uid')
-        # mail.ru, ms exchange server
-        for raw_flag_item in self._raw_flag_data:
-            uid_flag_match = re.search(r'(^|\s+)UID\s+(?P<uid>\d+)($|\s+)', raw_flag_item.decode())
-            if uid_flag_match:
-                return uid_flag_match.group('uid')
+        # zimbra, yandex, gmail, gmx - in data header; mail.ru, ms exchange server - in flag data
+        for raw_item in [self._raw_uid_data] + self._raw_flag_data:
+            uid_match = _UID_RE.search(raw_item)
+            if uid_match:
+                return uid_match.group('uid').decode()
         return None
 
-    @property
-    @lru_cache()
+    @cached_property
     def flags(self) -> (str,):
         """
         Message flags
         *This attribute will not be changed after actions: flag, seen
         """
         result = []
-        if type(self._raw_flag_data) is bytes:
-            result=imaplib.ParseFlags(self._raw_flag_data)
-        else:
-            for raw_flag_item in self._raw_flag_data:
-                result.extend(imaplib.ParseFlags(raw_flag_item))
+        for raw_flag_item in self._raw_flag_data:
+            result.extend(imaplib.ParseFlags(raw_flag_item))
         return tuple(i.decode().strip().replace('\\', '').upper() for i in result)
 
-    @property
-    @lru_cache()
+    @cached_property
     def subject(self) -> str:
         """Message subject"""
-        if 'subject' in self.obj:
-            msg_subject = decode_header(self.obj['subject'])
-            return decode_value(msg_subject[0][0], msg_subject[0][1])
-        return ''
+        raw_subject = self.obj['subject']
+        return decode_header_value(raw_subject) if raw_subject is not None else ''
 
-    @property
-    @lru_cache()
+    @cached_property
     def from_values(self) -> dict or None:
         """Sender (all data)"""
         result_set = parse_email_addresses(self.obj['From'] or '')
         return result_set[0] if result_set else None
 
-    @property
-    @lru_cache()
+    @cached_property
     def from_(self) -> str:
         """Sender email"""
         return self.from_values['email'] if self.from_values else ''
 
-    @property
-    @lru_cache()
+    @cached_property
     def to_values(self) -> (dict,):
         """Recipients (all data)"""
         return parse_email_addresses(self.obj['To'] or '')
 
-    @property
-    @lru_cache()
+    @cached_property
     def to(self) -> (str,):
         """Recipients emails"""
         return tuple(i['email'] for i in self.to_values)
 
-    @property
-    @lru_cache()
+    @cached_property
     def cc_values(self) -> (dict,):
         """Carbon copy (all data)"""
         return parse_email_addresses(self.obj['Cc'] or '')
 
-    @property
-    @lru_cache()
+    @cached_property
     def cc(self) -> (str,):
         """Carbon copy emails"""
         return tuple(i['email'] for i in self.cc_values)
 
-    @property
-    @lru_cache()
+    @cached_property
     def bcc_values(self) -> (dict,):
         """Blind carbon copy (all data)"""
         return parse_email_addresses(self.obj['Bcc'] or '')
 
-    @property
-    @lru_cache()
+    @cached_property
     def bcc(self) -> (str,):
         """Blind carbon copy emails"""
         return tuple(i['email'] for i in self.bcc_values)
 
-    @property
-    @lru_cache()
+    @cached_property
     def reply_to_values(self) -> (dict,):
         """Reply-to emails (all data)"""
         return parse_email_addresses(self.obj['Reply-To'] or '')
 
-    @property
-    @lru_cache()
+    @cached_property
     def reply_to(self) -> (str,):
         """Reply-to emails"""
         return tuple(i['email'] for i in self.reply_to_values)
 
-    @property
-    @lru_cache()
+    @cached_property
     def date_str(self) -> str:
         """Message sent date"""
         return str(self.obj['Date'] or '')
 
-    @property
-    @lru_cache()
+    @cached_property
     def date(self):
         """
         Message sent date
@@ -158,49 +160,45 @@ class MailMessage:
         """
         return parse_email_date(self.date_str)
 
-    @property
-    @lru_cache()
+    @cached_property
+    def _parts(self) -> [(str, email.message.Message)]:
+        """
+        Non-multipart parts of the message with their content types: [(content_type, part)]
+        Message tree is walked once for text, html and attachments
+        """
+        return [(part.get_content_type(), part) for part in self.obj.walk()
+                if part.get_content_maintype() != 'multipart']  # multipart/* are just containers
+
+    @cached_property
     def text(self) -> str:
         """Plain text of the mail message"""
-        for part in self.obj.walk():
-            # multipart/* are containers
-            if part.get_content_maintype() == 'multipart':
-                continue
-            if part.get_content_type() in ('text/plain', 'text/'):
+        for content_type, part in self._parts:
+            if content_type in ('text/plain', 'text/'):
                 return decode_value(part.get_payload(decode=True), part.get_content_charset())
         return ''
 
-    @property
-    @lru_cache()
+    @cached_property
     def html(self) -> str:
         """HTML text of the mail message"""
-        for part in self.obj.walk():
-            # multipart/* are containers
-            if part.get_content_maintype() == 'multipart':
-                continue
-            if part.get_content_type() == 'text/html':
+        for content_type, part in self._parts:
+            if content_type == 'text/html':
                 return decode_value(part.get_payload(decode=True), part.get_content_charset())
         return ''
 
-    @property
-    @lru_cache()
+    @cached_property
     def headers(self) -> {str: (str,)}:
         """Message headers"""
         raw_headers = getattr(self.obj, '_headers', ())
         return {key: tuple(v for k, v in raw_headers if k == key) for key in set(i[0] for i in raw_headers)}
 
-    @property
-    @lru_cache()
+    @cached_property
     def attachments(self) -> ['Attachment']:
         """
         Mail message attachments list
         :return: [Attachment]
         """
         results = []
-        for part in self.obj.walk():
-            if part.get_content_maintype() == 'multipart':
-                # multipart/* are just containers
-                continue
+        for _, part in self._parts:
             if part.get('Content-Disposition') is None:
                 continue
             filename = part.get_filename()
@@ -217,21 +215,29 @@ class Attachment:
     def __init__(self, part):
         self._part = part
 
-    @property
-    @lru_cache()
+    @cached_property
     def filename(self) -> str:
         filename = self._part.get_filename()
-        return decode_value(*decode_header(filename)[0])
+        return decode_header_value(filename)
 
-    @property
-    @lru_cache()
+    @cached_property
     def content_type(self) -> str:
         return self._part.get_content_type()
 
-    @property
-    @lru_cache()
+    def _pybase64_payload(self) -> bytes or None:
+        """Payload decoded by pybase64 for base64 encoded part, None if not applicable"""
+        if pybase64 is None or str(self._part.get('content-transfer-encoding', '')).lower().strip() != 'base64':
+            return None
+        try:
+            return pybase64.b64decode(self._part.get_payload(), validate=False)
+        except (ValueError, TypeError):  # incorrect padding, non-ascii data, multipart payload
+            return None
+
+    @cached_property
     def payload(self) -> bytes:
-        payload = self._part.get_payload(decode=True)
+        payload = self._pybase64_payload()
+        if payload is None:
+            payload = self._part.get_payload(decode=True)
         if payload:
             return payload
         # multipart payload, such as .eml (see get_payload)
@@ -248,3 +254,123 @@ class Attachment:
                             return payload_item_bytes  # quopri.decodestring
         # could not find payload
         return b''
+
+
+class FastMailMessage(MailMessage):
+    """
+    The email message, parsed by fast-mail-parser (Rust), instead of stdlib email parser
+    Requires: pip install fast-mail-parser
+    Differences from MailMessage:
+        obj - fast_mail_parser.PyMail object
+        headers - values are decoded
+    """
+
+    def __init__(self, fetch_data):
+        if fast_mail_parser is None:
+            raise ImportError('FastMailMessage requires fast-mail-parser: pip install fast-mail-parser')
+        super().__init__(fetch_data)
+
+    @cached_property
+    def obj(self):
+        """Original fast_mail_parser.PyMail object, email is parsed on first access"""
+        return fast_mail_parser.parse_email(self._raw_message_data)
+
+    @cached_property
+    def _raw_headers(self) -> {str: str}:
+        """
+        First raw (not decoded) value of each header by lower case name, from header block of raw message data
+        Address headers are parsed from raw values: decoded name like "Petrov, Ivan" breaks address parsing
+        """
+        header_block = _HEADER_BLOCK_END_RE.split(self._raw_message_data, 1)[0]
+        result = {}
+        for raw_header in _HEADER_LINE_END_RE.split(header_block):
+            name, separator, value = raw_header.partition(b':')
+            if separator:
+                result.setdefault(
+                    name.strip().decode('ascii', 'ignore').lower(), value.strip().decode('utf-8', 'replace'))
+        return result
+
+    def _header(self, name: str) -> str:
+        """First raw value of the header with case-insensitive name, empty str if not found"""
+        return self._raw_headers.get(name.lower(), '')
+
+    @cached_property
+    def subject(self) -> str:
+        """Message subject"""
+        return self.obj.subject or ''
+
+    @cached_property
+    def from_values(self) -> dict or None:
+        """Sender (all data)"""
+        result_set = parse_email_addresses(self._header('From'))
+        return result_set[0] if result_set else None
+
+    @cached_property
+    def to_values(self) -> (dict,):
+        """Recipients (all data)"""
+        return parse_email_addresses(self._header('To'))
+
+    @cached_property
+    def cc_values(self) -> (dict,):
+        """Carbon copy (all data)"""
+        return parse_email_addresses(self._header('Cc'))
+
+    @cached_property
+    def bcc_values(self) -> (dict,):
+        """Blind carbon copy (all data)"""
+        return parse_email_addresses(self._header('Bcc'))
+
+    @cached_property
+    def reply_to_values(self) -> (dict,):
+        """Reply-to emails (all data)"""
+        return parse_email_addresses(self._header('Reply-To'))
+
+    @cached_property
+    def date_str(self) -> str:
+        """Message sent date"""
+        return self.obj.date or ''
+
+    @cached_property
+    def text(self) -> str:
+        """Plain text of the mail message"""
+        return self.obj.text_plain[0] if self.obj.text_plain else ''
+
+    @cached_property
+    def html(self) -> str:
+        """HTML text of the mail message"""
+        return self.obj.text_html[0] if self.obj.text_html else ''
+
+    @cached_property
+    def headers(self) -> {str: (str,)}:
+        """Message headers, with decoded values"""
+        result = {}
+        for key, value in self.obj.headers.items():
+            result[key] = (value,) if isinstance(value, str) else tuple(value)
+        return result
+
+    @cached_property
+    def attachments(self) -> ['FastAttachment']:
+        """
+        Mail message attachments list
+        :return: [FastAttachment]
+        """
+        return [FastAttachment(i) for i in self.obj.attachments if i.filename]
+
+
+class FastAttachment:
+    """An attachment for a FastMailMessage"""
+
+    def __init__(self, attachment):
+        self._attachment = attachment
+
+    @property
+    def filename(self) -> str:
+        return self._attachment.filename
+
+    @property
+    def content_type(self) -> str:
+        return self._attachment.mimetype
+
+    @property
+    def payload(self) -> bytes:
+        return bytes(self._attachment.content)
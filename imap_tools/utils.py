@@ -1,11 +1,19 @@
 import re
 import inspect
+import itertools
 import datetime
 from email.utils import getaddresses
 from email.header import decode_header
 
 short_month_names = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', "Dec")
 
+_EMAIL_DATE_RE = re.compile(r'(?P<date>\d{1,2}\s+(' + '|'.join(short_month_names) + r')\s+\d{4})\s+' +
+                            r'(?P<time>\d{1,2}:\d{1,2}(:\d{1,2})?)\s*' +
+                            r'(?P<zone_sign>[+-])?(?P<zone>\d{4})?')
+
+_ADDRESS_NAME_SPECIALS = frozenset('"(),:;<>@[\\]')
+_ADDRESS_EMAIL_SPECIALS = frozenset('"(),:;<>[\\]')
+
 
 def cleaned_uid_set(uid_set: str or [str] or iter) -> str:
     """
@@ -59,6 +67,38 @@ def decode_value(value: bytes or str, encoding=None) -> str:
     return value
 
 
+def decode_header_value(value: str) -> str:
+    """
+    Decode first part of header value, that may be encoded by rfc2047: =?charset?encoding?encoded-text?=
+    Value without encoded words is returned as is - most headers are plain, decode_header is not needed
+    """
+    if isinstance(value, str) and '=?' not in value:
+        return value
+    return decode_value(*decode_header(value)[0])
+
+
+def _parse_single_email_address(raw_header: str) -> (str, str) or None:
+    """
+    Parse the most common headers with one address: 'name <email>', '<email>', 'email' without getaddresses
+    :return: (name, email) or None, when header needs full parsing by getaddresses
+    """
+    header = raw_header.strip()
+    if header.endswith('>'):
+        name_end = header.find('<')
+        if name_end < 0 or header.count('<') != 1 or header.count('>') != 1:
+            return None
+        name, email = header[:name_end], header[name_end + 1:-1]
+        if any(i in _ADDRESS_NAME_SPECIALS for i in name):
+            return None
+    else:
+        name, email = '', header
+    local_part, _, domain = email.partition('@')
+    if not (local_part and domain) or '@' in domain or \
+            any(i in _ADDRESS_EMAIL_SPECIALS or i.isspace() for i in email):
+        return None
+    return ' '.join(name.split()), email
+
+
 def parse_email_addresses(raw_header: str) -> (dict,):
     """
     Parse email addresses from header
@@ -66,8 +106,9 @@ def parse_email_addresses(raw_header: str) -> (dict,):
     :return: tuple(dict(name: str, email: str, full: str))
     """
     result = []
-    for raw_name, email in getaddresses([raw_header]):
-        name = decode_value(*decode_header(raw_name)[0]).strip()
+    single_address = _parse_single_email_address(raw_header)
+    for raw_name, email in ([single_address] if single_address else getaddresses([raw_header])):
+        name = decode_header_value(raw_name).strip()
         email = email.strip()
         if not (name or email):
             continue
@@ -81,9 +122,7 @@ def parse_email_addresses(raw_header: str) -> (dict,):
 
 def parse_email_date(value: str) -> datetime.datetime:
     """Parsing the date described in rfc2822"""
-    match = re.search(r'(?P<date>\d{1,2}\s+(' + '|'.join(short_month_names) + r')\s+\d{4})\s+' +
-                      r'(?P<time>\d{1,2}:\d{1,2}(:\d{1,2})?)\s*' +
-                      r'(?P<zone_sign>[+-])?(?P<zone>\d{4})?', value)
+    match = _EMAIL_DATE_RE.search(value)
     if match:
         group = match.groupdict()
         day, month, year = group['date'].split()
@@ -107,14 +146,33 @@ def parse_email_date(value: str) -> datetime.datetime:
 
 
 def quote(value: str or bytes):
+    """Quote value for IMAP command, escape only if needed - str.translate and byte loops are slower"""
     if isinstance(value, str):
-        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+        if '\\' in value or '"' in value:
+            value = value.replace('\\', '\\\\').replace('"', '\\"')
+        return '"' + value + '"'
     else:
-        return b'"' + value.replace(b'\\', b'\\\\').replace(b'"', b'\\"') + b'"'
+        if b'\\' in value or b'"' in value:
+            value = value.replace(b'\\', b'\\\\').replace(b'"', b'\\"')
+        return b'"' + value + b'"'
 
 
 def pairs_to_dict(items: list) -> dict:
     """Example: ['MESSAGES', '3', 'UIDNEXT', '4'] -> {'MESSAGES': '3', 'UIDNEXT': '4'}"""
     if len(items) % 2 != 0:
         raise ValueError('An even-length array is expected')
-    return dict((items[i * 2], items[i * 2 + 1]) for i in range(len(items) // 2))
+    items_iter = iter(items)
+    return dict(zip(items_iter, items_iter))
+
+
+def chunks(iterable: iter, chunk_size: int) -> iter:
+    """
+    Split iterable into tuples of chunk_size length, the last tuple may be shorter
+    Example: chunks('ABCDE', 2) -> ('A', 'B'), ('C', 'D'), ('E',)
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = tuple(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
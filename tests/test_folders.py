@@ -1,6 +1,8 @@
 import unittest
+from types import SimpleNamespace
 
 from tests.utils import MailboxTestCase, test_mailbox_name_set, get_test_mailbox
+from imap_tools.folder import MailBoxFolderManager
 
 
 class FoldersTest(MailboxTestCase):
@@ -51,5 +53,21 @@ class FoldersTest(MailboxTestCase):
                 self.assertIs(type(status_val), int)
 
 
+
+class FolderStatusTest(unittest.TestCase):
+
+    def test_status(self):
+        for status_data, status in (
+                (b'"a (b)" (MESSAGES 3 UIDNEXT 4)', {'MESSAGES': 3, 'UIDNEXT': 4}),
+                (b'INBOX (MESSAGES 3 RECENT 0 UIDNEXT 4 UIDVALIDITY 5 UNSEEN 1)',
+                 {'MESSAGES': 3, 'RECENT': 0, 'UIDNEXT': 4, 'UIDVALIDITY': 5, 'UNSEEN': 1}),
+        ):
+            box = SimpleNamespace(
+                _simple_command=lambda *args: ('OK', [b'STATUS completed']),
+                _untagged_response=lambda typ, dat, name, data=status_data: (typ, [data]))
+            folder_manager = MailBoxFolderManager(SimpleNamespace(box=box))
+            self.assertEqual(folder_manager.status('a (b)'), status)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,186 @@
+import email
+import unittest
+import collections
+from unittest import mock
+
+from imap_tools import MailBox
+
+
+class FakeBox:
+    """imaplib.IMAP4 stub: answers SEARCH with <message_cnt> emails, records sent commands"""
+
+    message = b'Subject: hi\r\n\r\nhello'
+
+    def __init__(self, message_cnt: int):
+        self.message_cnt = message_cnt
+        self.calls = []
+        self.sent = collections.deque()  # pipelined commands in flight: [(tag, message_set)]
+        self.untagged_responses = {}
+
+    def search(self, charset, criteria):
+        return 'OK', [b' '.join(str(i).encode() for i in range(1, self.message_cnt + 1))]
+
+    def fetch_data(self, message_set: bytes) -> list:
+        data = []
+        for i in sorted(int(i) for i in message_set.split(b',')):
+            data.append(('{} (UID {} FLAGS (\\Seen) BODY[] {{{}}}'.format(i, i * 10, len(self.message)).encode(),
+                         self.message))
+            data.append(b')')
+        return data
+
+    def fetch(self, message_set, message_parts):
+        self.calls.append(('FETCH', message_set, message_parts))
+        return 'OK', self.fetch_data(message_set)
+
+    def uid(self, command, *args):
+        self.calls.append((command,) + args)
+        self.untagged_responses.pop('FETCH', None)  # imaplib.IMAP4.uid takes untagged FETCH data
+        return 'OK', [command.encode()]
+
+    def _command(self, name, message_set, message_parts):
+        tag = 'T{}'.format(len(self.calls)).encode()
+        self.calls.append(('SEND', message_set))
+        self.sent.append((tag, message_set))
+        return tag
+
+    def _command_complete(self, name, tag):
+        sent_tag, message_set = self.sent.popleft()  # server answers in order of sending
+        assert sent_tag == tag
+        self.calls.append(('READ', message_set))
+        self.untagged_responses.setdefault('FETCH', []).extend(self.fetch_data(message_set))
+        return 'OK', [b'FETCH completed']
+
+    def _untagged_response(self, typ, dat, name):
+        return typ, self.untagged_responses.pop(name, [None])
+
+    def expunge(self):
+        self.calls.append(('EXPUNGE',))
+        return 'OK', [b'EXPUNGE']
+
+
+def get_fake_mailbox(message_cnt: int = 0) -> MailBox:
+    mailbox = MailBox.__new__(MailBox)  # without connection
+    mailbox.box = FakeBox(message_cnt)
+    mailbox._capabilities = set()
+    return mailbox
+
+
+class MailBoxTest(unittest.TestCase):
+
+    def test_split_fetch_data(self):
+        self.assertEqual(
+            MailBox._split_fetch_data([
+                b'1 (FLAGS (\\Recent) UID 7)', (b'1 (BODY[] {2}', b'hi'), b')',
+                b'2 (FLAGS (\\Seen) UID 8)', (b'2 (BODY[] {2}', b'ho'), b')',
+                (b'3 (UID 9 BODY[] {2}', b'he'), b' FLAGS (\\Seen))',
+                b'4 (FLAGS (\\Seen))',  # unsolicited, without data
+            ], [b'1', b'2', b'3', b'4']),
+            [[b'1 (FLAGS (\\Recent) UID 7)', (b'1 (BODY[] {2}', b'hi'), b')'],
+             [b'2 (FLAGS (\\Seen) UID 8)', (b'2 (BODY[] {2}', b'ho'), b')'],
+             [(b'3 (UID 9 BODY[] {2}', b'he'), b' FLAGS (\\Seen))']])
+        self.assertEqual(MailBox._split_fetch_data([None], [b'1']), [])
+        # server order is not guaranteed
+        self.assertEqual(
+            MailBox._split_fetch_data([
+                (b'3 (UID 9 BODY[] {2}', b'he'), b')', (b'1 (UID 7 BODY[] {2}', b'hi'), b')',
+                (b'2 (UID 8 BODY[] {2}', b'ho'), b')',
+            ], [b'2', b'3', b'1']),
+            [[(b'2 (UID 8 BODY[] {2}', b'ho'), b')'], [(b'3 (UID 9 BODY[] {2}', b'he'), b')'],
+             [(b'1 (UID 7 BODY[] {2}', b'hi'), b')']])
+
+    def test_fetch_bulk(self):
+        mailbox = get_fake_mailbox(7)
+        self.assertEqual([i.uid for i in mailbox.fetch(bulk=3)], ['10', '20', '30', '40', '50', '60', '70'])
+        self.assertEqual([i[1] for i in mailbox.box.calls], [b'1,2,3', b'4,5,6', b'7'])
+
+        mailbox = get_fake_mailbox(7)
+        self.assertEqual([i.uid for i in mailbox.fetch(bulk=3, reverse=True, limit=5)], ['70', '60', '50', '40', '30'])
+        self.assertEqual([i[1] for i in mailbox.box.calls], [b'7,6,5', b'4,3'])
+
+        mailbox = get_fake_mailbox(3)
+        self.assertEqual([i.uid for i in mailbox.fetch(bulk=0)], ['10', '20', '30'])
+        self.assertEqual([i[1] for i in mailbox.box.calls], [b'1', b'2', b'3'])
+
+    def test_fetch_pipelined(self):
+        mailbox = get_fake_mailbox(7)
+        mailbox.fetch_pipeline_depth = 2
+        self.assertEqual([i.uid for i in mailbox.fetch(bulk=2)], ['10', '20', '30', '40', '50', '60', '70'])
+        self.assertEqual(mailbox.box.calls, [
+            ('SEND', b'1,2'), ('SEND', b'3,4'), ('READ', b'1,2'), ('READ', b'3,4'),
+            ('SEND', b'5,6'), ('SEND', b'7'), ('READ', b'5,6'), ('READ', b'7')])
+
+        # other commands inside fetch loop
+        mailbox = get_fake_mailbox(7)
+        mailbox.fetch_pipeline_depth = 3
+        uid_list = []
+        for message in mailbox.fetch(bulk=2, reverse=True):
+            uid_list.append(message.uid)
+            mailbox.copy(message.uid, 'folder')
+        self.assertEqual(uid_list, ['70', '60', '50', '40', '30', '20', '10'])
+
+        # early stop
+        mailbox = get_fake_mailbox(7)
+        mailbox.fetch_pipeline_depth = 2
+        for _ in mailbox.fetch(bulk=2):
+            break
+        self.assertFalse(mailbox.box.sent)
+        self.assertEqual([i.uid for i in mailbox.fetch(bulk=2, limit=1)], ['10'])
+
+    def test_fetch_message_parts(self):
+        mailbox = get_fake_mailbox(1)
+        for kwargs in ({}, {'mark_seen': False}, {'headers_only': True}, {'headers_only': True, 'mark_seen': False}):
+            list(mailbox.fetch(**kwargs))
+        self.assertEqual([i[2] for i in mailbox.box.calls], [
+            '(BODY[] UID FLAGS)', '(BODY.PEEK[] UID FLAGS)',
+            '(BODY.PEEK[HEADER] UID FLAGS)', '(BODY.PEEK[HEADER] UID FLAGS)'])
+
+        # header block of multipart email is defective without body
+        mailbox = get_fake_mailbox(3)
+        mailbox.box.message = b'Subject: hi\r\nContent-Type: multipart/alternative; boundary="b1"\r\n\r\n'
+        self.assertEqual([i.uid for i in mailbox.fetch(headers_only=True)], ['10', '20', '30'])
+        self.assertEqual([i.uid for i in mailbox.fetch()], [])
+
+    def test_fetch_lazy_parse(self):
+        with mock.patch('email.message_from_bytes', wraps=email.message_from_bytes) as message_from_bytes:
+            self.assertEqual([i.uid for i in get_fake_mailbox(2).fetch(miss_defect=False)], ['10', '20'])
+            self.assertEqual(message_from_bytes.call_count, 0)
+            self.assertEqual([i.uid for i in get_fake_mailbox(2).fetch()], ['10', '20'])
+            self.assertEqual(message_from_bytes.call_count, 2)
+
+    def test_uid_bulk(self):
+        mailbox = get_fake_mailbox()
+        uid_list = [str(i) for i in range(1, 251)]
+        store_result, expunge_result = mailbox.delete(uid_list)
+        self.assertEqual(store_result, ('OK', [b'STORE', b'STORE', b'STORE']))
+        self.assertEqual(expunge_result, ('OK', [b'EXPUNGE']))
+        self.assertEqual([i[0] for i in mailbox.box.calls], ['STORE', 'STORE', 'STORE', 'EXPUNGE'])
+        self.assertEqual([i[1] for i in mailbox.box.calls[:3]],
+                         [','.join(uid_list[:100]), ','.join(uid_list[100:200]), ','.join(uid_list[200:])])
+
+        mailbox = get_fake_mailbox()
+        mailbox.uid_bulk = 2
+        self.assertEqual(mailbox.copy('1,2,3', 'folder'), ('OK', [b'COPY', b'COPY']))
+        self.assertEqual(mailbox.box.calls, [('COPY', '1,2', 'folder'), ('COPY', '3', 'folder')])
+
+        mailbox = get_fake_mailbox()
+        mailbox.uid_bulk = 2
+        mailbox.flag(['1', '2', '3'], ['SEEN', 'FLAGGED'], False)
+        self.assertEqual(mailbox.box.calls, [('STORE', '1,2', '-FLAGS', '(\\SEEN \\FLAGGED)'),
+                                             ('STORE', '3', '-FLAGS', '(\\SEEN \\FLAGGED)'), ('EXPUNGE',)])
+
+        self.assertIsNone(mailbox.delete([]))
+
+    def test_move(self):
+        mailbox = get_fake_mailbox()
+        copy_result, (store_result, expunge_result) = mailbox.move(['1', '2'], 'folder')
+        self.assertEqual((copy_result, store_result, expunge_result),
+                         (('OK', [b'COPY']), ('OK', [b'STORE']), ('OK', [b'EXPUNGE'])))
+
+        mailbox = get_fake_mailbox()
+        mailbox._capabilities = {'IMAP4REV1', 'MOVE'}
+        self.assertEqual(mailbox.move(['1', '2'], 'folder'), (('OK', [b'MOVE']), None))
+        self.assertEqual(mailbox.box.calls, [('MOVE', '1,2', 'folder')])
+
+
+if __name__ == "__main__":
+    unittest.main()
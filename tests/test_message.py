@@ -1,10 +1,12 @@
 import os
+import base64
 import unittest
 import datetime
 from tests.utils import MailboxTestCase
 
 from tests.data import MESSAGE_ATTRIBUTES
-from imap_tools import MailMessage
+from imap_tools import MailMessage, FastMailMessage
+from imap_tools.message import fast_mail_parser
 
 
 class MessageTest(MailboxTestCase):
@@ -60,5 +62,55 @@ class MessageTest(MailboxTestCase):
                     self.assertEqual(getattr(att, att_attr), message_data['attachments'][att_i][att_attr])
 
 
+class MessageParseTest(unittest.TestCase):
+
+    def test_uid_flags(self):
+        for fetch_data, uid, flags in (
+                ([(b'1 (UID 7 FLAGS (\\Seen NonJunk) BODY[] {2}', b'hi'), b')'], '7', ('SEEN', 'NONJUNK')),
+                ([(b'1 (BODY[] {2}', b'hi'), b' UID 7 FLAGS (\\Seen))'], '7', ('SEEN',)),
+                ([b'1 (FLAGS (\\Recent) UID 7)', (b'1 (BODY[] {2}', b'hi'), b')'], '7', ('RECENT',)),
+                ([(b'1 (FLAGS () BODY[] {2}', b'hi'), b')'], None, ()),
+                ([(None, b'hi')], None, ()),
+        ):
+            message = MailMessage(fetch_data)
+            self.assertEqual(message.uid, uid)
+            self.assertEqual(message.flags, flags)
+
+
+    def test_text_charset(self):
+        for charset, cte, raw_text in (
+                ('windows-1251', '8bit', 'привет'.encode('cp1251')),
+                ('koi8-r', 'base64', base64.b64encode('привет'.encode('koi8-r'))),
+                ('utf-8', '8bit', 'привет'.encode()),
+                ('unknown-8bit', '8bit', 'привет'.encode()),
+        ):
+            message = MailMessage.from_bytes(
+                b'Content-Type: text/plain; charset="' + charset.encode() + b'"\r\n' +
+                b'Content-Transfer-Encoding: ' + cte.encode() + b'\r\n\r\n' + raw_text)
+            self.assertEqual(message.text, 'привет')
+
+
+    @unittest.skipIf(fast_mail_parser is None, 'fast-mail-parser is not installed')
+    def test_fast_attributes(self):
+        msg_attr_set = {'subject', 'from_', 'to', 'cc', 'bcc', 'reply_to', 'date', 'date_str',
+                        'from_values', 'to_values', 'cc_values', 'bcc_values', 'reply_to_values'}
+        for file_name in MESSAGE_ATTRIBUTES.keys():
+            message_data = MESSAGE_ATTRIBUTES[file_name]
+            with open(os.path.join(os.path.dirname(__file__), 'messages', '{}.eml'.format(file_name)), 'rb') as f:
+                message = FastMailMessage.from_bytes(f.read())
+            for msg_attr in msg_attr_set:
+                self.assertEqual(getattr(message, msg_attr), message_data[msg_attr])
+            self.assertEqual([i.filename for i in message.attachments],
+                             [i['filename'] for i in message_data['attachments']])
+        # encoded name with comma
+        raw_message_data = b'From: =?utf-8?B?ItCf0LXRgtGA0L7Qsiwg0JjQstCw0L0i?= <ivan@x.ru>\r\n' \
+                           b'To: a@b.ru,\r\n =?utf-8?B?ItCf0LXRgtGA0L7Qsiwg0JjQstCw0L0i?= <c@d.ru>\r\n\r\nhi'
+        message = FastMailMessage.from_bytes(raw_message_data)
+        self.assertEqual(message.from_, 'ivan@x.ru')
+        self.assertEqual(message.to, ('a@b.ru', 'c@d.ru'))
+        for msg_attr in ('from_values', 'to_values'):
+            self.assertEqual(getattr(message, msg_attr), getattr(MailMessage.from_bytes(raw_message_data), msg_attr))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -13,12 +13,19 @@ class UtilsTest(unittest.TestCase):
         self.assertEqual(utils.quote('str \\'), '"str \\\\"')
         self.assertEqual(utils.quote(b'\xd1\x8f'), b'"\xd1\x8f"')
         self.assertEqual(utils.quote(b'\\ \xd1\x8f  \\'), b'"\\\\ \xd1\x8f  \\\\"')
+        self.assertEqual(utils.quote('say "hi" \\'), '"say \\"hi\\" \\\\"')
+        self.assertEqual(utils.quote(b'say "hi"'), b'"say \\"hi\\""')
 
     def test_pairs_to_dict(self):
         self.assertEqual(utils.pairs_to_dict(['MESSAGES', '3', 'UIDNEXT', '4']), {'MESSAGES': '3', 'UIDNEXT': '4'})
         with self.assertRaises(ValueError):
             utils.pairs_to_dict(['1', '2', '3'])
 
+    def test_chunks(self):
+        self.assertEqual(list(utils.chunks('ABCDE', 2)), [('A', 'B'), ('C', 'D'), ('E',)])
+        self.assertEqual(list(utils.chunks([1, 2, 3], 3)), [(1, 2, 3)])
+        self.assertEqual(list(utils.chunks((), 2)), [])
+
     def test_decode_value(self):
         self.assertEqual(utils.decode_value('str привет 你好', 'not matter'), 'str привет 你好')
         self.assertEqual(utils.decode_value(b'str \xd0\xb4\xd0\xb0 \xe4\xbd\xa0'), 'str да 你')
@@ -26,6 +33,12 @@ class UtilsTest(unittest.TestCase):
         self.assertEqual(utils.decode_value(b'\xef\xf0\xe8\xe2\xe5\xf2', 'cp1251'), 'привет')
         self.assertEqual(utils.decode_value(b'str \xd0\xb4\xd0\xb0 \xe4\xbd\xa0', 'wat?'), 'str да 你')
 
+    def test_decode_header_value(self):
+        self.assertEqual(utils.decode_header_value('plain =? text'), 'plain =? text')
+        self.assertEqual(utils.decode_header_value('plain text'), 'plain text')
+        self.assertEqual(utils.decode_header_value('=?UTF-8?B?0J7Qu9C1=?='), 'Оле')
+        self.assertEqual(utils.decode_header_value('=?utf-8?Q?ATO.RU?='), 'ATO.RU')
+
     def test_check_command_status(self):
         self.assertIsNone(utils.check_command_status('box.fetch', ('EXP', 'command_result_data'), expected='EXP'))
         self.assertIsNone(utils.check_command_status('test', ('OK', 'res')))
@@ -78,6 +91,14 @@ class UtilsTest(unittest.TestCase):
         ):
             self.assertEqual(utils.parse_email_date(val), exp)
 
+    def test_parse_single_email_address(self):
+        self.assertEqual(utils._parse_single_email_address(' Ivan  Petrov\r\n <ivan@mail.ru>'),
+                         ('Ivan Petrov', 'ivan@mail.ru'))
+        self.assertEqual(utils._parse_single_email_address('<ivan@mail.ru>'), ('', 'ivan@mail.ru'))
+        self.assertEqual(utils._parse_single_email_address('ivan@mail.ru '), ('', 'ivan@mail.ru'))
+        for raw_header in ('"Petrov, Ivan" <ivan@mail.ru>', 'a@b.ru, c@d.ru', 'ivan', 'a <b> <c@d.ru>', 'A <@>'):
+            self.assertIsNone(utils._parse_single_email_address(raw_header))
+
     def test_parse_email_addresses(self):
         self.assertEqual(
             utils.parse_email_addresses('=?UTF-8?B?0J7Qu9C1=?= <name@company.ru>,\r\n "\'\\"z, z\\"\'" <ya@ya.ru>\f'),